@@ -1,6 +1,41 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
-import re
-from math import floor
+from math import asin, copysign, cos, floor, nan, pi, sin, sqrt
+
+import numpy as np
+
+__all__ = ['Equatorial', 'sph_dist', 'sph_dist_into', 'sph_dist_matrix', 'SphDistTarget']
+
+# Translation table mapping the sexigesimal separators [,:dhms] to <space>
+_TRANS = str.maketrans(',:dhms', '      ')
+
+# Zero-padded strings for the integer sexigesimal fields.  Dec degrees outside
+# the table fall back to formatting.
+_TWO_DIGIT = {i: f"{i:02d}" for i in range(100)}
+
+# Set of input dtypes for which distances are computed in float32
+_FLOAT32_ONLY = {np.dtype(np.float32)}
+
+
+def _decompose(ra, dec):
+    """Split decimal ``ra``, ``dec`` (deg) into sexigesimal components.
+
+    Returns a tuple of ``(ra, rah, ram, ras, decsign, decd, decm, decs)``
+    where ``ra`` is wrapped to 0 <= ra < 360.
+    """
+    ra = ra - floor(ra / 360.) * 360
+
+    ra15 = ra / 15.
+    rah = floor(ra15)
+    ram = floor((ra15 - rah) * 60)
+    ras = (ra15 - rah - ram / 60.) * 60 * 60
+
+    decsign = '-' if dec < 0 else '+'
+    absdec = abs(dec)
+    decd = floor(absdec)
+    decm = floor((absdec - decd) * 60)
+    decs = (absdec - decd - decm / 60.) * 60 * 60
+
+    return ra, rah, ram, ras, decsign, decd, decm, decs
 
 
 class Equatorial(object):
@@ -24,7 +59,16 @@ class Equatorial(object):
     ================== =========================
 
     The sexigesimal delimiter is controlled by the ``delim`` attribute and is
-    the colon character by default.
+    the colon character by default.  The sexigesimal strings are computed on
+    first access and cached until ``delim`` is changed.
+
+    The strings are rounded to 1 ms of RA and 0.01 arcsec of Dec, carrying
+    into the minutes, degrees and hours as needed (e.g. 23:59:59.9996 becomes
+    00:00:00.000).  Rounding uses ``round()``, so exact half-unit ties round
+    to the even digit, and values within floating point round-off of a tie
+    may go either way.  For six-value input the seconds are rounded as given
+    (matching ``%.3f`` / ``%.2f`` formatting); out-of-range fields (e.g. 61
+    minutes) are first normalized.
 
     Examples::
 
@@ -37,79 +81,166 @@ class Equatorial(object):
       >>> print(pos)
       RA, Dec = 180.25975, -34.2095 = 12 01 02.340, -34 12 34.11
     """
+    __slots__ = ('_delim', 'ra', 'dec', 'rah', 'ram', 'ras', 'decsign', 'decd', 'decm',
+                 'decs', 'ra0', '_ra_mas', '_dec_cas', '_ra_hms', '_dec_dms')
+
     def __init__(self, *args):
         self.delim = ':'
-        argstr = ' '.join(str(x).strip() for x in args)
-        argstr = re.sub(r'[,:dhms]', ' ', argstr)
-        args = argstr.split()
+        if len(args) == 6 and all(isinstance(x, (int, float)) for x in args):
+            # Six separate numbers.  Their str() never contains a separator or
+            # whitespace, so the join / translate / split pipeline is not needed.
+            args = [str(x) for x in args]
+        else:
+            argstr = ' '.join(str(x).strip() for x in args)
+            argstr = argstr.translate(_TRANS)
+            args = argstr.split()
 
         if len(args) == 2:
             ra, dec = [float(x) for x in args]
-            ra = ra - floor(ra / 360.) * 360
-
-            ra15 = ra / 15.
-            rah = int(floor(ra15))
-            ram = int(floor((ra15 - rah) * 60))
-            ras = (ra15 - rah - ram / 60.) * 60 * 60
-
-            decsign = '-' if dec < 0 else '+'
-            absdec = abs(dec)
-            decd = int(floor(absdec))
-            decm = int(floor((absdec - decd) * 60))
-            decs = (absdec - decd - decm / 60.) * 60 * 60
+            ra, rah, ram, ras, decsign, decd, decm, decs = _decompose(ra, dec)
+            ra_mas = None
 
         elif len(args) == 6:
             rah = int(args[0])
             ram = int(args[1])
             ras = float(args[2])
 
-            decsign = '-' if args[3].startswith('-') else '+'
-            decd = abs(int(args[3]))
+            # Sign of dec comes from the string so that e.g. "-00" is negative
+            sign = -1 if args[3][0] == '-' else 1
+            decsign = '-' if sign < 0 else '+'
+            decd = sign * int(args[3])
             decm = int(args[4])
             decs = float(args[5])
 
             ra = 15.0 * (rah + ram/60. + ras/3600.)
-            dec = abs(decd) + decm/60. + decs/3600.
-            if decsign == '-':
-                dec = -dec
+            dec = sign * (decd + decm/60. + decs/3600.)
+
+            # Out-of-range fields (e.g. 25 hours or 75 seconds) are normalized
+            # so the attributes agree with ``ra``, ``dec`` and the strings.
+            # In-range fields are rounded for output from the values as given
+            # (round(x, n) matches the %.nf formatting of the seconds), rather
+            # than from the ``ra`` and ``dec`` rebuilt from them.
+            if (0 <= rah < 24 and 0 <= ram < 60 and 0 <= ras < 60
+                    and 0 <= decm < 60 and 0 <= decs < 60):
+                ra_mas = (rah * 3600 + ram * 60) * 1000 + round(round(ras, 3) * 1000)
+                dec_cas = (decd * 3600 + decm * 60) * 100 + round(round(decs, 2) * 100)
+            else:
+                ra, rah, ram, ras, decsign, decd, decm, decs = _decompose(ra, dec)
+                # Keep the sign of e.g. "-00 00 75" (dec == -0.0)
+                decsign = '-' if copysign(1.0, dec) < 0 else '+'
+                ra_mas = None
         else:
             raise ValueError('Input args %s does not have 2 or 6 values' % args)
 
         ra0 = ra - (360 if ra > 180 else 0)
 
-        for attr in ('ra', 'dec', 'rah', 'ram', 'ras', 'decsign', 'decd', 'decm', 'decs', 'ra0'):
-            setattr(self, attr, eval(attr))
+        self.ra = ra
+        self.dec = dec
+        self.rah = rah
+        self.ram = ram
+        self.ras = ras
+        self.decsign = decsign
+        self.decd = decd
+        self.decm = decm
+        self.decs = decs
+        self.ra0 = ra0
+
+        # RA in milliseconds of time and |Dec| in centi-arcsec, i.e. the units
+        # of the last digit in ``ra_hms`` and ``dec_dms``.
+        if ra_mas is None:
+            ra_mas = round(ra * 240000)
+            dec_cas = round(abs(dec) * 360000)
+        self._ra_mas = ra_mas
+        self._dec_cas = dec_cas
+
+    @staticmethod
+    def from_arrays(ra, dec):
+        """Convert arrays of decimal ``ra``, ``dec`` (deg) to sexigesimal
+        components in one vectorized pass.
+
+        This is the array equivalent of creating ``Equatorial(ra[i], dec[i])``
+        for each element, without constructing the objects.  The return value
+        is a dict of arrays keyed by the corresponding ``Equatorial``
+        attribute names: ``ra``, ``dec``, ``ra0``, ``rah``, ``ram``, ``ras``,
+        ``decsign``, ``decd``, ``decm`` and ``decs``.
+
+        Examples::
 
-    # Generate good sexigesimal strings.  Little bit tricky because of
-    # floating point and rollover issues.  There is probably a better way...
+          >>> out = ska_astro.Equatorial.from_arrays([123.4, 0.5], [-34.12, 10.0])
+          >>> out['rah'], out['decsign']
+          (array([8, 0]), array(['-', '+'], dtype='<U1'))
+
+        As with ``Equatorial``, non-finite (NaN or inf) values are not
+        allowed and raise ``ValueError``.
+
+        :param ra: RA (deg)
+        :param dec: Dec (deg)
+
+        :rtype: dict of numpy arrays
+        """
+        ra = np.asarray(ra, dtype=float)
+        dec = np.asarray(dec, dtype=float)
+        if not (np.all(np.isfinite(ra)) and np.all(np.isfinite(dec))):
+            raise ValueError('Input ra and dec must be finite')
+        ra = ra - np.floor(ra / 360.) * 360
+
+        ra15 = ra / 15.
+        rah = np.floor(ra15)
+        ram = np.floor((ra15 - rah) * 60)
+        ras = (ra15 - rah - ram / 60.) * 60 * 60
+
+        absdec = np.abs(dec)
+        decd = np.floor(absdec)
+        decm = np.floor((absdec - decd) * 60)
+        decs = (absdec - decd - decm / 60.) * 60 * 60
+
+        return {'ra': ra,
+                'dec': dec,
+                'ra0': np.where(ra > 180, ra - 360, ra),
+                'rah': rah.astype(int),
+                'ram': ram.astype(int),
+                'ras': ras,
+                'decsign': np.where(dec < 0, '-', '+'),
+                'decd': decd.astype(int),
+                'decm': decm.astype(int),
+                'decs': decs}
+
+    def get_delim(self):
+        return self._delim
+
+    def set_delim(self, delim):
+        # Sexigesimal strings are cached on first access, so drop them whenever
+        # the delimiter changes.
+        self._delim = delim
+        self._ra_hms = None
+        self._dec_dms = None
+    delim = property(get_delim, set_delim)
+
+    # Generate good sexigesimal strings.  Rounding is done once in the integer
+    # units of the last printed digit so that rollover (e.g. 59.9996 sec) is
+    # carried into the higher fields by divmod.
     def get_ra_hms(self):
-        ram, rah = self.ram, self.rah
-        s_ras = "%06.3f" % self.ras
-        if s_ras == '60.000':
-            s_ras = '00.000'
-            ram += 1
-        s_ram = "%02d" % ram
-        if s_ram == '60':
-            s_ram = '00'
-            rah += 1
-        s_rah = "%02d" % rah
-        if s_rah == '24':
-            s_rah = '00'
-        return self.delim.join([s_rah, s_ram, s_ras])
+        if self._ra_hms is not None:
+            return self._ra_hms
+        rah, ms = divmod(self._ra_mas, 3600000)
+        ram, ms = divmod(ms, 60000)
+        ras, ms = divmod(ms, 1000)
+        rah %= 24
+        s_ras = f"{_TWO_DIGIT[ras]}.{ms:03d}"
+        self._ra_hms = self.delim.join([_TWO_DIGIT[rah], _TWO_DIGIT[ram], s_ras])
+        return self._ra_hms
     ra_hms = property(get_ra_hms)
 
     def get_dec_dms(self):
-        decm, decd = self.decm, self.decd
-        s_decs = "%05.2f" % self.decs
-        if s_decs == '60.00':
-            s_decs = '00.00'
-            decm += 1
-        s_decm = "%02d" % decm
-        if s_decm == '60':
-            s_decm = '00'
-            decd += 1
-        s_decd = "%02d" % decd
-        return self.decsign + self.delim.join([s_decd, s_decm, s_decs])
+        if self._dec_dms is not None:
+            return self._dec_dms
+        decd, cs = divmod(self._dec_cas, 360000)
+        decm, cs = divmod(cs, 6000)
+        decs, cs = divmod(cs, 100)
+        s_decd = _TWO_DIGIT.get(decd) or f"{decd:02d}"
+        s_decs = f"{_TWO_DIGIT[decs]}.{cs:02d}"
+        self._dec_dms = self.decsign + self.delim.join([s_decd, _TWO_DIGIT[decm], s_decs])
+        return self._dec_dms
 
     dec_dms = property(get_dec_dms)
 
@@ -117,39 +248,262 @@ class Equatorial(object):
         return 'RA, Dec = %.5f, %.4f = %s, %s' % (self.ra, self.dec,
                                                   self.ra_hms, self.dec_dms)
 
-def sph_dist(a1, d1, a2, d2):
+
+def _sph_dist_scalar(a1, d1, a2, d2):
+    """Haversine distance (deg) for Python scalar inputs.
+
+    Uses the ``math`` module since for a single pair the cost of ``sph_dist``
+    is dominated by the per-call overhead of dispatching numpy ufuncs.
+    """
+    rad = pi / 180
+    try:
+        h = (sin((d1 - d2) * rad / 2) ** 2
+             + cos(d1 * rad) * cos(d2 * rad) * sin((a1 - a2) * rad / 2) ** 2)
+    except ValueError:
+        # math.sin/cos of inf raise, whereas the numpy ufuncs give nan
+        return nan
+    return 2 * asin(sqrt(min(max(h, 0.0), 1.0))) / rad
+
+
+def _calc_dtype(*args):
+    """Float dtype for a distance calculation: float32 if all array inputs are
+    float32, otherwise float64.
+    """
+    dtypes = {x.dtype for x in args if isinstance(x, np.ndarray)}
+    return np.float32 if dtypes == _FLOAT32_ONLY else np.float64
+
+
+def _sph_dist_kernel(a1, d1, a2, d2, cos_d1, cos_d2, hd, out):
+    """Evaluate the haversine distance (deg) into ``out`` in its dtype.
+
+    ``a1``, ``d1``, ``a2``, ``d2`` are in degrees and ``cos_d1``, ``cos_d2`` are
+    the precomputed cosines of the declinations.  ``hd`` is a buffer with the
+    broadcast shape of ``d1`` and ``d2`` for the dec term.  It is written only
+    after ``cos_d1`` and ``cos_d2`` are used, so it may share their memory.
+    """
+    # Coordinate differences are taken in degrees (in the float dtype, so
+    # integer inputs cannot wrap) and the pi/180 factor and half-angle are
+    # applied in place.  Each step updates ``out`` or ``hd`` via the ufunc
+    # ``out`` argument instead of allocating a new temporary.
+    dtype = out.dtype
+    rad = dtype.type(np.pi / 180)
+    rad2 = rad / 2
+
+    # NumPy's in-place ufunc path is about twice as slow for single-element
+    # arrays, so those are evaluated out of place and copied to ``out`` at the
+    # end.  The temporaries are then only one element.
+    h_out = out if out.size > 1 else None
+    hd_out = hd if hd.size > 1 else None
+
+    h = np.subtract(a1, a2, out=h_out, dtype=dtype)
+    h = np.multiply(h, rad2, out=h_out)
+    h = np.sin(h, out=h_out)
+    h = np.square(h, out=h_out)
+    h = np.multiply(h, cos_d1, out=h_out)
+    h = np.multiply(h, cos_d2, out=h_out)
+
+    hd = np.subtract(d1, d2, out=hd_out, dtype=dtype)
+    hd = np.multiply(hd, rad2, out=hd_out)
+    hd = np.sin(hd, out=hd_out)
+    hd = np.square(hd, out=hd_out)
+
+    h = np.add(h, hd, out=h_out)
+    h = np.maximum(h, dtype.type(0), out=h_out)
+    h = np.minimum(h, dtype.type(1), out=h_out)
+
+    h = np.sqrt(h, out=h_out)
+    h = np.arcsin(h, out=h_out)
+    h = np.multiply(h, 2 / rad, out=h_out)
+
+    if h_out is None:
+        out[...] = h
+
+    return out
+
+
+def sph_dist(a1, d1, a2, d2, dtype=None):
     """Calculate spherical distance between two sky positions.  Uses the haversine
     formula so accuracy degrades at distances near 180 degrees.
 
     The input coordinates can be either native python types (float, int) or
-    numpy arrays.  The output will matchin the input type.
+    numpy arrays.  The output is a float for scalar inputs and a numpy array
+    otherwise.
 
     >>> ska_astro.sph_dist(1, 2, 3, 4)
-    2.8264172166623145
+    2.8264172166623136
     >>> ska_astro.sph_dist(1, 2, np.array([1,2,3,4]), np.array([4,5,6,7]))
     array([ 2.        ,  3.16165191,  4.46977556,  5.82570185])
 
+    The calculation is done in float32 if all array inputs are float32 (Python
+    scalars do not count), otherwise float64.  In particular a float32
+    catalog compared with a Python float position, e.g. ``sph_dist(ra, dec,
+    3.0, 4.0)``, gives a float32 result (earlier versions returned float64
+    here).  Use ``dtype=np.float64`` for full precision in that case.
+
     :param a1: RA position 1 (deg)
     :param d1: dec position 1 (deg)
     :param a2: RA position 2 (deg)
     :param d2: dec position 2 (deg)
+    :param dtype: float type for the calculation (default is float32 if all
+                  array inputs are float32, otherwise float64)
 
     :rtype: spherical distance (deg)
     """
-    import numpy as np
+    if (dtype is None and isinstance(a1, (int, float)) and isinstance(d1, (int, float))
+            and isinstance(a2, (int, float)) and isinstance(d2, (int, float))):
+        return _sph_dist_scalar(a1, d1, a2, d2)
+
+    if dtype is None:
+        dtype = _calc_dtype(a1, d1, a2, d2)
+    else:
+        dtype = np.dtype(dtype)
+        if dtype.kind != 'f':
+            raise ValueError('dtype must be a floating point type, got %s' % dtype)
+
+    h = np.empty(np.broadcast(a1, d1, a2, d2).shape, dtype=dtype)
+    _sph_dist_into(a1, d1, a2, d2, h)
+
+    return (h if h.ndim else h.item())
+
+
+def sph_dist_into(a1, d1, a2, d2, out, work=None):
+    """Calculate spherical distance between two sky positions into an existing
+    output array.
+
+    This is the same as ``sph_dist`` but writes the result into the
+    preallocated float array ``out`` (which sets the dtype for the
+    calculation) instead of allocating a new one.
+
+    The calculation also needs scratch space for ``cos(d1)``, ``cos(d2)`` and
+    the dec term, which is allocated on each call unless a ``work`` array is
+    supplied.  Callers evaluating many distances with a stable shape can
+    allocate ``out`` and ``work`` once and reuse them, in which case no arrays
+    are allocated per call.  A ``work`` array of ``2 * out.size`` elements is
+    always sufficient.
+
+    ``out`` and ``work`` must not share memory with the inputs or each other,
+    since the inputs are read after ``out`` and ``work`` are partly written.
+    Overlap raises ``ValueError``.
+
+    >>> out = np.empty(4)
+    >>> ska_astro.sph_dist_into(1, 2, np.array([1,2,3,4]), np.array([4,5,6,7]), out)
+    array([2.        , 3.16165191, 4.46977556, 5.82570185])
+
+    :param a1: RA position 1 (deg)
+    :param d1: dec position 1 (deg)
+    :param a2: RA position 2 (deg)
+    :param d2: dec position 2 (deg)
+    :param out: output array with the broadcast shape of the inputs
+    :param work: optional 1-d scratch array with the dtype of ``out`` and at
+                 least ``max(d1.size + d2.size, broadcast(d1, d2).size)`` elements
+
+    :rtype: ``out`` containing spherical distance (deg)
+    """
+    if work is not None and (work.dtype != out.dtype or work.ndim != 1):
+        raise ValueError('work must be a 1-d %s array' % out.dtype)
+    inputs = [x for x in (a1, d1, a2, d2) if isinstance(x, np.ndarray)]
+    for buf in (out, work):
+        if buf is not None and any(np.may_share_memory(buf, x) for x in inputs):
+            raise ValueError('out and work must not share memory with the inputs')
+    if work is not None and np.may_share_memory(out, work):
+        raise ValueError('out and work must not share memory')
+
+    return _sph_dist_into(a1, d1, a2, d2, out, work)
+
+
+def _sph_dist_into(a1, d1, a2, d2, out, work=None):
+    """Unchecked implementation of ``sph_dist_into``."""
+    dtype = out.dtype
+    rad = dtype.type(np.pi / 180)
+
+    n1 = np.size(d1)
+    n12 = n1 + np.size(d2)
+    hd_bcast = np.broadcast(d1, d2)
+    size = max(n12, hd_bcast.size)
+    if work is None:
+        work = np.empty(size, dtype=dtype)
+    elif work.size < size:
+        raise ValueError('work must have at least %d elements' % size)
+
+    # Both declinations share the start of ``work`` so that a single in-place
+    # np.cos call gives cos(d1) and cos(d2).  The dec term then reuses the same
+    # memory since the kernel consumes the cosines first.
+    cos_d1 = np.multiply(d1, rad, out=work[:n1].reshape(np.shape(d1)), dtype=dtype)
+    cos_d2 = np.multiply(d2, rad, out=work[n1:n12].reshape(np.shape(d2)), dtype=dtype)
+    np.cos(work[:n12], out=work[:n12])
+    hd = work[:hd_bcast.size].reshape(hd_bcast.shape)
+
+    return _sph_dist_kernel(a1, d1, a2, d2, cos_d1, cos_d2, hd, out)
+
+
+def sph_dist_matrix(a1, d1, a2, d2):
+    """Calculate the matrix of spherical distances between every position in
+    one list of sky positions and every position in a second list.
+
+    This is equivalent to ``sph_dist(a1[:, None], d1[:, None], a2, d2)``.
+    The haversine terms are evaluated for all N x M pairs (so the accuracy
+    at small separations is the same as ``sph_dist``), but ``cos(dec)`` is
+    only computed for the N + M input positions.
+
+    >>> ska_astro.sph_dist_matrix([1, 2], [2, 3], [3, 4, 5], [4, 5, 6])
+    array([[2.82641722, 4.23844056, 5.64938494],
+           [1.4128862 , 2.82491133, 4.23585921]])
+
+    :param a1: RA positions 1 (deg)
+    :param d1: dec positions 1 (deg)
+    :param a2: RA positions 2 (deg)
+    :param d2: dec positions 2 (deg)
+
+    :rtype: N x M array of spherical distances (deg)
+    """
+    return sph_dist(np.ravel(a1)[:, None], np.ravel(d1)[:, None],
+                    np.ravel(a2)[None, :], np.ravel(d2)[None, :])
+
+
+class SphDistTarget(object):
+    """Fixed set of sky positions for repeated ``sph_dist`` calculations.
+
+    In crossmatch-style workloads one side of the distance (e.g. a reference
+    catalog) is the same for many queries.  ``SphDistTarget`` converts those
+    positions to float and computes ``cos(dec)`` once, and ``to()`` then only
+    has to process the query positions.  As with ``sph_dist``, the
+    calculation uses float32 if the target and all array query positions are
+    float32, otherwise float64.
+
+    Examples::
+
+      >>> target = ska_astro.SphDistTarget(np.array([1, 2, 3, 4]), np.array([4, 5, 6, 7]))
+      >>> target.to(1, 2)
+      array([2.        , 3.16165191, 4.46977556, 5.82570185])
+
+    :param a2: RA of target positions (deg)
+    :param d2: dec of target positions (deg)
+    """
+    def __init__(self, a2, d2):
+        dtype = _calc_dtype(a2, d2)
+        self.a = np.asarray(a2, dtype=dtype)
+        self.d = np.asarray(d2, dtype=dtype)
+        self.cd = np.cos(self.d * dtype(np.pi / 180))
 
-    def haversine(theta):
-        return np.sin(theta/2)**2
+    def to(self, a1, d1):
+        """Calculate spherical distance from ``a1``, ``d1`` to the target positions.
 
-    ndarray = any(isinstance(x, np.ndarray) for x in (a1, d1, a2, d2))
+        This is equivalent to ``sph_dist(a1, d1, a2, d2)`` where ``a2``, ``d2``
+        are the target positions.
 
-    a1 = np.radians(a1)
-    d1 = np.radians(d1)
-    a2 = np.radians(a2)
-    d2 = np.radians(d2)
+        :param a1: RA position(s) (deg)
+        :param d1: dec position(s) (deg)
 
-    h = haversine(d1-d2) + np.cos(d1) * np.cos(d2) * haversine(a1-a2)
-    h = np.where(abs(h) > 1.0, np.sign(h), h)
-    dist = np.degrees(2 * np.arcsin(np.sqrt(h)))
+        :rtype: spherical distance (deg)
+        """
+        dtype = np.dtype(_calc_dtype(a1, d1, self.a, self.d))
+        rad = dtype.type(np.pi / 180)
+        out = np.empty(np.broadcast(a1, d1, self.a, self.d).shape, dtype=dtype)
+        cos_d1 = np.cos(np.multiply(d1, rad, dtype=dtype))
+        # A float64 query against a float32 target needs float64 cosines
+        cos_d2 = (self.cd if self.cd.dtype == dtype
+                  else np.cos(np.multiply(self.d, rad, dtype=dtype)))
+        hd = np.empty(np.broadcast(d1, self.d).shape, dtype=dtype)
+        _sph_dist_kernel(a1, d1, self.a, self.d, cos_d1, cos_d2, hd, out)
 
-    return (dist if ndarray else dist.tolist())
+        return (out if out.ndim else out.item())
@@ -0,0 +1,331 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from ska_astro import (Equatorial, SphDistTarget, sph_dist, sph_dist_into,
+                       sph_dist_matrix)
+
+
+def get_positions(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, 360, n), rng.uniform(-90, 90, n)
+
+
+def test_sph_dist_matrix():
+    a1, d1 = get_positions(20, seed=1)
+    a2, d2 = get_positions(30, seed=2)
+    dists = sph_dist_matrix(a1, d1, a2, d2)
+    assert dists.shape == (20, 30)
+    for i in range(20):
+        assert np.allclose(dists[i], sph_dist(a1[i], d1[i], a2, d2), rtol=0, atol=1e-12)
+
+
+def test_sph_dist_matrix_small_separation():
+    a1, d1 = get_positions(10)
+    a2 = a1 + 1e-6
+    dists = sph_dist_matrix(a1, d1, a2, d1)
+    assert np.allclose(np.diag(dists), sph_dist(a1, d1, a2, d1), rtol=1e-12, atol=0)
+
+
+def test_from_arrays():
+    ra, dec = get_positions(1000)
+    ra = np.concatenate([ra - 360, ra + 360, [0, 180, 359.9999999]])
+    dec = np.concatenate([dec, dec, [0, -0.0, 89.999999]])
+    out = Equatorial.from_arrays(ra, dec)
+    for i in range(len(ra)):
+        pos = Equatorial(ra[i], dec[i])
+        for attr, vals in out.items():
+            assert getattr(pos, attr) == vals[i]
+
+
+def test_equatorial_rollover():
+    pos = Equatorial(359.9999999999, -0.9999999999)
+    assert pos.ra_hms == '00:00:00.000'
+    assert pos.dec_dms == '-01:00:00.00'
+
+    pos = Equatorial(23, 59, 59.9996, -10, 59, 59.996)
+    assert (pos.rah, pos.ram, pos.ras) == (23, 59, 59.9996)
+    assert pos.ra_hms == '00:00:00.000'
+    assert pos.dec_dms == '-11:00:00.00'
+
+
+def test_equatorial_tie_rounding():
+    # Six-value input rounds the seconds as given, like %.3f / %.2f formatting:
+    # exact binary ties go to the even digit, others use the exact binary value.
+    pos = Equatorial(1, 2, 3.0625, 4, 38, 47.125)
+    assert pos.ra_hms == '01:02:03.062'
+    assert pos.dec_dms == '+04:38:47.12'
+    assert Equatorial("01 02 03 04 38 16.605").dec_dms == '+04:38:16.61'
+    assert Equatorial(0, 0, 0.0005, 0, 0, 0.005).ra_hms == '00:00:00.001'
+
+    # Decimal input is rounded from ra / dec with round() (half to even)
+    assert Equatorial(506.0940135, -75.4286875).dec_dms == '-75:25:43.28'
+
+
+def test_equatorial_out_of_range_fields():
+    pos = Equatorial(25, 0, 0, 100, 0, 0)
+    assert (pos.rah, pos.ram, pos.ras) == (1, 0, 0)
+    assert pos.ra == 15
+    assert str(pos) == 'RA, Dec = 15.00000, 100.0000 = 01:00:00.000, +100:00:00.00'
+
+    pos = Equatorial(12, 61, 0, 5, 0, 75.)
+    assert (pos.rah, pos.ram, pos.decd, pos.decm) == (13, 1, 5, 1)
+    assert pos.ra_hms == '13:01:00.000'
+    assert pos.dec_dms == '+05:01:15.00'
+
+    pos = Equatorial(-1, 0, 0, 5, 0, 0)
+    assert pos.rah == 23
+    assert pos.ra == 345
+    assert pos.ra_hms == '23:00:00.000'
+
+
+def test_sph_dist_integer_arrays():
+    # Differences must be taken in float, not in the (wrapping) input dtype
+    u = np.array([1, 2], dtype=np.uint8)
+    v = np.array([3, 4], dtype=np.uint8)
+    assert np.allclose(sph_dist(u, u, v, v), sph_dist([1., 2.], [1., 2.], [3., 4.], [3., 4.]))
+
+    a1, d1, a2, d2 = (np.array(x, dtype=np.uint16) for x in ([0, 0], [10, 0], [5, 1], [20, 0]))
+    exp = sph_dist(a1.astype(float), d1.astype(float), a2.astype(float), d2.astype(float))
+    assert np.allclose(sph_dist(a1, d1, a2, d2), exp)
+    assert np.allclose(exp, [11.10, 1.], atol=0.01)
+
+    d1, d2 = np.array([100], dtype=np.int8), np.array([-100], dtype=np.int8)
+    assert np.allclose(sph_dist(0, d1, 0, d2), [160])
+
+
+def test_namespace():
+    import ska_astro
+
+    for name in ('np', 'sin', 'cos', 'pi', 'floor'):
+        assert not hasattr(ska_astro, name)
+    for name in ska_astro.astro.__all__:
+        assert getattr(ska_astro, name) is getattr(ska_astro.astro, name)
+
+
+def test_sph_dist_target():
+    a1, d1 = get_positions(100, seed=1)
+    a2, d2 = get_positions(100, seed=2)
+    target = SphDistTarget(a2, d2)
+    assert np.allclose(target.to(a1, d1), sph_dist(a1, d1, a2, d2), rtol=0, atol=1e-12)
+    for i in range(5):
+        assert np.allclose(target.to(a1[i], d1[i]), sph_dist(a1[i], d1[i], a2, d2),
+                           rtol=0, atol=1e-12)
+
+    dist = SphDistTarget(3, 4).to(1, 2)
+    assert type(dist) is float
+    assert np.isclose(dist, sph_dist(1, 2, 3, 4), rtol=0, atol=1e-12)
+
+
+def test_sph_dist_target_float32():
+    a2, d2 = (x.astype(np.float32) for x in get_positions(100, seed=2))
+    target = SphDistTarget(a2, d2)
+    dists = target.to(10.0, 20.0)
+    assert dists.dtype == np.float32
+    assert np.allclose(dists, sph_dist(10.0, 20.0, a2, d2), rtol=0, atol=1e-4)
+
+
+def test_sph_dist_into():
+    a1, d1 = get_positions(1000, seed=1)
+    a2, d2 = get_positions(1000, seed=2)
+    exp = sph_dist(a1, d1, a2, d2)
+
+    out = np.empty(1000)
+    assert sph_dist_into(a1, d1, a2, d2, out) is out
+    assert np.all(out == exp)
+
+    work = np.empty(2 * out.size)
+    out[:] = 0
+    sph_dist_into(a1, d1, a2, d2, out, work)
+    assert np.all(out == exp)
+
+    out = np.empty((1000, 5))
+    sph_dist_into(a1[:, None], d1[:, None], a2[:5], d2[:5], out, np.empty(2 * out.size))
+    assert np.allclose(out, sph_dist_matrix(a1, d1, a2[:5], d2[:5]), rtol=0, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        sph_dist_into(a1, d1, a2, d2, np.empty(1000), work[:10])
+    with pytest.raises(ValueError):
+        sph_dist_into(a1, d1, a2, d2, np.empty(1000), work.astype(np.float32))
+
+
+def test_sph_dist_into_overlap():
+    a1, d1 = get_positions(100, seed=1)
+    a2, d2 = get_positions(100, seed=2)
+    exp = sph_dist(a1, d1, a2, d2)
+
+    with pytest.raises(ValueError, match='share memory'):
+        sph_dist_into(a1, d1, a2, d2, out=d1)
+    with pytest.raises(ValueError, match='share memory'):
+        sph_dist_into(a1, d1, a2, d2, np.empty(100), work=a2)
+    work = np.empty(300)
+    with pytest.raises(ValueError, match='share memory'):
+        sph_dist_into(a1, d1, a2, d2, work[:100], work[50:])
+
+    # Inputs are left untouched by the rejected calls
+    assert np.all(sph_dist(a1, d1, a2, d2) == exp)
+
+
+def test_sph_dist_into_no_allocation():
+    a1, d1 = get_positions(100000, seed=1)
+    a2, d2 = get_positions(100000, seed=2)
+    out = np.empty(a1.size)
+    work = np.empty(2 * out.size)
+
+    tracemalloc.start()
+    sph_dist_into(a1, d1, a2, d2, out, work)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < out.nbytes / 10
+
+
+def test_equatorial_delim_clears_cache():
+    pos = Equatorial("12:01:02.34, -34:12:34.11")
+    assert pos.ra_hms == '12:01:02.340'
+    assert pos.dec_dms == '-34:12:34.11'
+    pos.delim = ' '
+    assert pos.ra_hms == '12 01 02.340'
+    assert pos.dec_dms == '-34 12 34.11'
+    assert str(pos) == 'RA, Dec = 180.25975, -34.2095 = 12 01 02.340, -34 12 34.11'
+
+
+@pytest.mark.parametrize('bad', [np.nan, np.inf, -np.inf])
+def test_from_arrays_non_finite(bad):
+    with pytest.raises((ValueError, OverflowError)):
+        Equatorial(bad, 0)
+    with pytest.raises(ValueError):
+        Equatorial.from_arrays([10.0, bad], [0.0, 0.0])
+    with pytest.raises(ValueError):
+        Equatorial.from_arrays([10.0, 20.0], [0.0, bad])
+
+
+def test_sph_dist_float32():
+    a1, d1 = (x.astype(np.float32) for x in get_positions(100, seed=1))
+    a2, d2 = (x.astype(np.float32) for x in get_positions(100, seed=2))
+    exp = sph_dist(a1.astype(float), d1.astype(float), a2.astype(float), d2.astype(float))
+
+    dists = sph_dist(a1, d1, a2, d2)
+    assert dists.dtype == np.float32
+    assert np.allclose(dists, exp, rtol=0, atol=1e-4)
+
+    # Python scalars do not widen a float32 calculation
+    assert sph_dist(a1, d1, 3.0, 4.0).dtype == np.float32
+    # Any float64 array does
+    assert sph_dist(a1, d1, a2.astype(float), d2).dtype == np.float64
+
+    # Explicit dtype overrides the default either way
+    dists = sph_dist(a1, d1, a2, d2, dtype=np.float64)
+    assert dists.dtype == np.float64
+    assert np.allclose(dists, exp, rtol=0, atol=1e-4)
+    assert sph_dist(a1.astype(float), d1, a2, d2, dtype='f4').dtype == np.float32
+    assert isinstance(sph_dist(1, 2, 3, 4, dtype=np.float32), float)
+
+
+@pytest.mark.parametrize('dtype', [int, np.int32, bool, complex])
+def test_sph_dist_bad_dtype(dtype):
+    with pytest.raises(ValueError, match='floating point'):
+        sph_dist(np.ones(2), np.ones(2), 3.0, 4.0, dtype=dtype)
+
+
+ATTRS = ('ra', 'dec', 'ra0', 'rah', 'ram', 'ras', 'decsign', 'decd', 'decm', 'decs',
+         'ra_hms', 'dec_dms')
+
+
+@pytest.mark.parametrize('args', [(12, 1, 2.34, -34, 12, 34.11),
+                                  (0, 0, 0, 0, 0, 0),
+                                  (23, 59, 59.9996, 89, 59, 59.996),
+                                  (1, 2, 3, -0, 30, 0),
+                                  (1, 2, 3.0625, 4, 38, 47.125),
+                                  (25, 61, 75.5, 5, 0, 75.)])
+def test_equatorial_six_numbers_fast_path(args):
+    pos = Equatorial(*args)
+    pos_str = Equatorial(' '.join(str(x) for x in args))
+    for attr in ATTRS:
+        assert getattr(pos, attr) == getattr(pos_str, attr)
+
+
+@pytest.mark.parametrize('args', [(12.0, 1, 2.34, -34, 12, 34.11),
+                                  (12, 1, 2.34, -34, 12.5, 34.11)])
+def test_equatorial_six_numbers_float_int_field(args):
+    with pytest.raises(ValueError):
+        Equatorial(' '.join(str(x) for x in args))
+    with pytest.raises(ValueError):
+        Equatorial(*args)
+
+
+def test_sph_dist_return_type():
+    exp = sph_dist(1, 2, 3, 4)
+    assert isinstance(exp, float)
+
+    # Lists and 1-element arrays give ndarray
+    dists = sph_dist([1, 2], [2, 3], 3, 4)
+    assert isinstance(dists, np.ndarray)
+    assert dists.shape == (2,)
+    assert dists[0] == exp
+    dists = sph_dist(np.array([1.0]), 2, 3, 4)
+    assert isinstance(dists, np.ndarray)
+    assert dists.shape == (1,)
+
+    # 0-d arrays and numpy scalars give a Python float
+    for a1 in (np.array(1.0), np.float64(1.0), np.float32(1.0)):
+        dist = sph_dist(a1, 2, 3, 4)
+        assert type(dist) is float
+        assert dist == pytest.approx(exp, rel=1e-6)
+
+
+@pytest.mark.parametrize('bad', [np.nan, np.inf, -np.inf])
+def test_sph_dist_non_finite(bad):
+    for args in ((bad, 2, 3, 4), (1, bad, 3, 4), (1, 2, bad, 4), (1, 2, 3, bad)):
+        dist = sph_dist(*args)
+        assert isinstance(dist, float)
+        assert np.isnan(dist)
+        with np.errstate(invalid='ignore'):
+            assert np.isnan(sph_dist(*(np.array([x]) for x in args))[0])
+
+
+def test_sph_dist_lower_clamp():
+    # (0, 90 + x) and (180, 90 - x) are the same point, but cos(d1) * cos(d2) < 0
+    # and round-off can make the haversine slightly negative.  That must be
+    # clamped to zero instead of giving nan from sqrt.
+    x = np.random.default_rng(0).uniform(0, 90, 1000)
+    dists = sph_dist(0.0, 90 + x, 180.0, 90 - x)
+    assert not np.any(np.isnan(dists))
+    assert np.allclose(dists, 0, rtol=0, atol=1e-5)
+    for i in range(20):
+        assert sph_dist(0.0, 90 + x[i], 180.0, 90 - x[i]) < 1e-5
+
+
+def test_sph_dist_target_mixed_dtype():
+    a2, d2 = (x.astype(np.float32) for x in get_positions(100, seed=2))
+    a1, d1 = a2.astype(float) + 1e-7, d2.astype(float)
+    target = SphDistTarget(a2, d2)
+
+    dists = target.to(a1, d1)
+    exp = sph_dist(a1, d1, a2, d2)
+    assert dists.dtype == exp.dtype == np.float64
+    assert np.allclose(dists, exp, rtol=1e-6, atol=0)
+
+    dists = target.to(a1.astype(np.float32), d1.astype(np.float32))
+    assert dists.dtype == np.float32
+
+
+def test_equatorial_negative_zero_dec():
+    pos = Equatorial("01 02 03 -00 30 00")
+    assert pos.decsign == '-'
+    assert (pos.decd, pos.decm, pos.decs) == (0, 30, 0)
+    assert pos.dec == -0.5
+    assert pos.dec_dms == '-00:30:00.00'
+
+    # Dec of -0.0 on the normalization branch (out-of-range RA) keeps the sign
+    pos = Equatorial("25 00 00 -00 00 00")
+    assert pos.rah == 1
+    assert pos.dec == 0
+    assert pos.decsign == '-'
+    assert pos.dec_dms == '-00:00:00.00'
+
+    pos = Equatorial("01 02 03 +00 00 -30")
+    assert pos.decsign == '-'
+    assert pos.dec_dms == '-00:00:30.00'